@@ -13,10 +13,8 @@ setup(
     package_dir={'': 'src'},
     install_requires=[
         'openai',
-        'argparse',  # or 'click' if you choose to use Click for CLI
         'pydub',     # for audio file handling
         'numpy',     # for numerical operations if needed
-        'scipy',     # for additional audio processing if needed
     ],
     classifiers=[
         'Programming Language :: Python :: 3',
@@ -1,76 +1,123 @@
 import argparse
 import os
 import traceback
-from transcriber import Transcriber
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from transcriber import DEFAULT_CACHE_DIR, Transcriber
 from logger import get_logger
+from utils import WriterPool
 
 logger = get_logger(__name__)
 
-def main():
+# Input files are matched on their lowercased extension
+_AUDIO_EXTS = frozenset(('.wav', '.mp3', '.m4a'))
+
+
+def _process_one(transcriber, writer, args, audio_file, audio_path, size):
+    """Transcribe a single audio file and queue the requested outputs on the writer.
+
+    Runs on a worker thread; errors are logged per file so one failure does not affect the others.
+    """
+    try:
+        transcription = transcriber.transcribe(audio_path, size=size)
+    except Exception as exc:
+        logger.error("Error transcribing file", extra={"details": {"audio_file": audio_file, "audio_path": audio_path, "error": str(exc)}})
+        return
+
+    base_name = os.path.splitext(audio_file)[0]
+
+    # Save verbatim transcription (conventional name: [original_filename]_transcription.txt)
+    verbatim_filename = os.path.join(args.output_folder, f"{base_name}_transcription.txt")
+    writer.submit(verbatim_filename, transcription.encode('utf-8'), "verbatim transcription", {"audio_file": audio_file})
+
+    # When both enhanced outputs are requested, get them from a single request so the transcript
+    # is only sent once; fall back to separate requests if the combined one fails
+    enhanced = interview_text = None
+    if args.enhance_for_reading and args.format_as_interview:
+        try:
+            both = transcriber.enhance_both(transcription)
+            enhanced, interview_text = both["enhanced"], both["interview"]
+        except Exception as exc:
+            logger.warning("Combined enhancement failed, falling back to separate requests", extra={"details": {"audio_file": audio_file, "error": str(exc)}})
+
+    # Optional: readability-enhanced version
+    if args.enhance_for_reading:
+        try:
+            if enhanced is None:
+                enhanced = transcriber.enhance_transcription(transcription)
+            enhanced_filename = os.path.join(args.output_folder, f"{base_name}_enhanced.txt")
+            writer.submit(enhanced_filename, enhanced.encode('utf-8'), "enhanced (readability) transcription", {"audio_file": audio_file})
+        except Exception as exc:
+            logger.error("Error creating enhanced (readability) transcription", extra={"details": {"audio_file": audio_file, "error": str(exc)}})
+            traceback.print_exc()
+
+    # Optional: OpenAI interview-formatted version
+    if args.format_as_interview:
+        try:
+            if interview_text is None:
+                interview_text = transcriber.enhance_as_interview(transcription)
+            interview_filename = os.path.join(args.output_folder, f"{base_name}_enhanced_interview.txt")
+            writer.submit(interview_filename, interview_text.encode('utf-8'), "interview-formatted transcription", {"audio_file": audio_file})
+        except Exception as exc:
+            logger.error("Error creating interview-formatted transcription", extra={"details": {"audio_file": audio_file, "error": str(exc)}})
+            # Print traceback
+            traceback.print_exc()
+
+
+def _build_parser():
     parser = argparse.ArgumentParser(description="Process audio recordings and generate transcriptions.")
     parser.add_argument('--input_folder', type=str, required=True, help='Path to the folder containing audio files.')
     parser.add_argument('--output_folder', type=str, required=True, help='Path to the folder where transcriptions will be saved.')
     parser.add_argument('--enhance_for_reading', action='store_true', help='Enhance transcriptions for better readability.')
     parser.add_argument('--format_as_interview', action='store_true', help='Use OpenAI to format the transcription as an interview between two people (saved as *_enhanced_interview.txt).')
+    parser.add_argument('--jobs', type=int, default=8, help='Number of audio files to process concurrently (default: 8).')
+    parser.add_argument('--no-cache', action='store_true', help='Do not read or write the local transcription cache.')
+    return parser
 
-    args = parser.parse_args()
 
-    if not os.path.exists(args.input_folder):
-        logger.error("Input folder does not exist", {"input_folder": args.input_folder})
-        return
+# The argument layout is fixed, so the parser is built once at import time
+_PARSER = _build_parser()
 
-    if not os.path.exists(args.output_folder):
-        os.makedirs(args.output_folder, exist_ok=True)
 
-    transcriber = Transcriber()
+def main():
+    args = _PARSER.parse_args()
 
-    supported_ext = ('.wav', '.mp3', '.m4a')
-    for audio_file in os.listdir(args.input_folder):
-        if not audio_file.lower().endswith(supported_ext):
-            continue
+    if args.jobs < 1:
+        _PARSER.error("--jobs must be at least 1")
 
-        audio_path = os.path.join(args.input_folder, audio_file)
-        try:
-            transcription = transcriber.transcribe(audio_path)
-        except Exception as exc:
-            logger.error("Error transcribing file", {"audio_file": audio_file, "audio_path": audio_path, "error": str(exc)})
-            continue
+    if not os.path.exists(args.input_folder):
+        logger.error("Input folder does not exist", extra={"details": {"input_folder": args.input_folder}})
+        return
 
-        base_name = os.path.splitext(audio_file)[0]
+    os.makedirs(args.output_folder, exist_ok=True)
 
-        # Save verbatim transcription (conventional name: [original_filename]_transcription.txt)
-        verbatim_filename = os.path.join(args.output_folder, f"{base_name}_transcription.txt")
-        try:
-            with open(verbatim_filename, 'w', encoding='utf-8') as f:
-                f.write(transcription)
-            logger.info("Saved verbatim transcription", {"verbatim_filename": verbatim_filename, "audio_file": audio_file})
-        except Exception as exc:
-            logger.error("Error saving verbatim transcription", {"audio_file": audio_file, "verbatim_filename": verbatim_filename, "error": str(exc)})
+    transcriber = Transcriber(cache_dir=None if args.no_cache else DEFAULT_CACHE_DIR)
 
-        # Optional: readability-enhanced version
-        if args.enhance_for_reading:
-            try:
-                enhanced = transcriber.enhance_transcription(transcription)
-                enhanced_filename = os.path.join(args.output_folder, f"{base_name}_enhanced.txt")
-                with open(enhanced_filename, 'w', encoding='utf-8') as f:
-                    f.write(enhanced)
-                logger.info("Saved enhanced (readability) transcription", {"enhanced_filename": enhanced_filename, "audio_file": audio_file})
-            except Exception as exc:
-                logger.error("Error creating enhanced (readability) transcription", {"audio_file": audio_file, "error": str(exc)})
-                traceback.print_exc()
-
-        # Optional: OpenAI interview-formatted version
-        if args.format_as_interview:
-            try:
-                interview_text = transcriber.enhance_as_interview(transcription)
-                interview_filename = os.path.join(args.output_folder, f"{base_name}_enhanced_interview.txt")
-                with open(interview_filename, 'w', encoding='utf-8') as f:
-                    f.write(interview_text)
-                logger.info("Saved interview-formatted transcription", {"interview_filename": interview_filename, "audio_file": audio_file})
-            except Exception as exc:
-                logger.error("Error creating interview-formatted transcription", {"audio_file": audio_file, "error": str(exc)})
-                # Print traceback
-                traceback.print_exc()
+    # Filter on the name first: non-audio entries are skipped without any stat, and is_file()
+    # usually comes from the directory listing itself; only matching files are stat'ed for their size
+    with os.scandir(args.input_folder) as entries:
+        audio_files = [
+            (entry.name, entry.path, entry.stat().st_size)
+            for entry in entries
+            if os.path.splitext(entry.name)[1].lower() in _AUDIO_EXTS and entry.is_file()
+        ]
+
+    # Transcription is I/O-bound on the OpenAI round-trip, so threads let uploads overlap;
+    # output files are written by a single background writer
+    writer = WriterPool()
+    try:
+        with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+            futures = {
+                executor.submit(_process_one, transcriber, writer, args, audio_file, audio_path, size): audio_file
+                for audio_file, audio_path, size in audio_files
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as exc:
+                    logger.error("Unexpected error processing file", extra={"details": {"audio_file": futures[future], "error": str(exc)}})
+                    traceback.print_exc()
+    finally:
+        writer.join()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,25 +1,42 @@
 import logging
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Mapping
+
+try:
+    import orjson  # optional: faster serialization of log details
+except ImportError:
+    orjson = None
+
+
+# Same compact form as the serialized details themselves
+_UNSERIALIZABLE_DETAILS = json.dumps({"error": "could not serialize details"}, separators=(",", ":"))
+
+
+def _serialize_details(details: Mapping[str, Any] | None) -> str:
+    """Serialize log details to compact JSON, or a fixed error object if they can't be encoded."""
+    if details is None:
+        return "{}"
+    try:
+        if orjson is not None:
+            return orjson.dumps(details, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+        return json.dumps(details, default=str, ensure_ascii=False, separators=(",", ":"))
+    except Exception:
+        return _UNSERIALIZABLE_DETAILS
 
 
 class JsonDetailsFormatter(logging.Formatter):
     """Formatter that prints the message as plain text and a JSON-encoded `details` property.
 
+    Details are serialized with orjson when it is installed, otherwise with the stdlib json module;
+    both produce the same compact output.
+
     Output example:
-    INFO: Starting transcription | {"file": "path/to/file.wav", "size_bytes": 12345}
+    INFO: Starting transcription | {"file":"path/to/file.wav","size_bytes":12345}
     """
 
     def format(self, record: logging.LogRecord) -> str:
         message = record.getMessage()
-        details = getattr(record, "details", None)
-        if details is None:
-            details_str = "{}"
-        else:
-            try:
-                details_str = json.dumps(details, default=str, ensure_ascii=False)
-            except Exception:
-                details_str = json.dumps({"error": "could not serialize details"})
+        details_str = _serialize_details(getattr(record, "details", None))
         return f"{record.levelname}: {message} | {details_str}"
 
 
@@ -34,14 +51,20 @@ def get_logger(name: str = __name__) -> logging.Logger:
     return logger
 
 
-# Convenience functions
+# Convenience functions (skip building the record entirely when the level is disabled)
 def info(message: str, details: Dict[str, Any] | None = None) -> None:
-    get_logger().info(message, extra={"details": details})
+    logger = get_logger()
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(message, extra={"details": details})
 
 
 def warning(message: str, details: Dict[str, Any] | None = None) -> None:
-    get_logger().warning(message, extra={"details": details})
+    logger = get_logger()
+    if logger.isEnabledFor(logging.WARNING):
+        logger.warning(message, extra={"details": details})
 
 
 def error(message: str, details: Dict[str, Any] | None = None) -> None:
-    get_logger().error(message, extra={"details": details})
+    logger = get_logger()
+    if logger.isEnabledFor(logging.ERROR):
+        logger.error(message, extra={"details": details})
@@ -1,34 +1,141 @@
+import asyncio
 import openai
 import os
 import io
-import math
+import json
+import logging
+import subprocess
 import tempfile
-from typing import List
+import threading
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from pydub import AudioSegment
 from logger import get_logger
+from utils import hash_file
 
 logger = get_logger(__name__)
 
+# Extensions split by duration with an ffmpeg stream copy instead of being decoded by pydub, mapped
+# to the ffmpeg output options for piping a segment to stdout. MP4/M4A needs the fragmented layout
+# because the regular one seeks back to the start of the file to write its index.
+# WAV stays on the size-based path: 5 minutes of PCM can exceed max_bytes.
+_PIPE_FORMATS = {
+    'm4a': ['-f', 'mp4', '-movflags', 'frag_keyframe+empty_moov'],
+    'mp3': ['-f', 'mp3'],
+}
+
+# Enhance prompts are built as _TRANSCRIPT_HEADER + transcript + <task>_INSTRUCTIONS. The transcript
+# comes first so that, together with the shared system message, every enhance request for a file
+# starts with the same byte-identical prefix, which OpenAI's prompt cache can reuse between calls.
+_ENHANCE_SYSTEM_PROMPT = (
+    "You edit verbatim transcripts. Preserve the original content and meaning exactly—do not "
+    "invent, omit, or add facts. Follow the instructions that come after the transcript."
+)
+_TRANSCRIPT_HEADER = "Transcript:\n"
+_READABILITY_INSTRUCTIONS = (
+    "\n\n---\n"
+    "Instructions: Return the same content edited for readability: add punctuation, "
+    "capitalization, and paragraph breaks. Do not change meaning or add new information.\n\n"
+    "Output:"
+)
+_INTERVIEW_INSTRUCTIONS = (
+    "\n\n---\n"
+    "Instructions: Reformat the transcript into a clear interview between two people labeled "
+    "'Interviewer' and 'Interviewee'. Improve readability with punctuation, capitalization, "
+    "and short paragraphs for each turn. Use the format:\n\n"
+    "Interviewer: <question or prompt>\n"
+    "Interviewee: <response>\n\n"
+    "If speaker identity is unclear, assign turns logically but do not attribute words to a "
+    "specific real person. Keep the tone neutral and faithful to the source.\n\n"
+    "Formatted interview:"
+)
+_COMBINED_INSTRUCTIONS = (
+    "\n\n---\n"
+    "Instructions: Produce two versions of the transcript and return them as a JSON object "
+    "with exactly two string fields, \"enhanced\" and \"interview\".\n"
+    "- \"enhanced\": the same content edited for readability: add punctuation, capitalization, "
+    "and paragraph breaks. Do not change meaning or add new information.\n"
+    "- \"interview\": the transcript reformatted into a clear interview between two people labeled "
+    "'Interviewer' and 'Interviewee', with punctuation, capitalization, and short paragraphs "
+    "for each turn, one turn per line as 'Interviewer: ...' or 'Interviewee: ...'. If speaker "
+    "identity is unclear, assign turns logically but do not attribute words to a specific "
+    "real person. Keep the tone neutral and faithful to the source."
+)
+
+# Transcriptions are cached here, keyed by model and file content, so reruns skip the upload
+DEFAULT_CACHE_DIR = os.path.join(
+    os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "voice-transcription-engine",
+)
+
+
+# Caps the ffmpeg processes running at once across the whole process. Files are transcribed on
+# several threads, each splitting on its own event loop, so an asyncio semaphore (bound to one
+# loop) could not enforce it.
+_FFMPEG_SLOTS = threading.BoundedSemaphore(os.cpu_count() or 1)
+
+
+async def _run_ffmpeg(cmd: List[str]) -> bytes:
+    """Run one ffmpeg command and return its stdout; raises CalledProcessError on failure."""
+    # Wait for a slot off the event loop so the loop's other segments keep being read meanwhile
+    await asyncio.to_thread(_FFMPEG_SLOTS.acquire)
+    try:
+        # stdin is closed: concurrent ffmpegs would otherwise read the terminal, and a
+        # backgrounded CLI would be stopped by SIGTTIN
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, stdin=asyncio.subprocess.DEVNULL, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await proc.communicate()
+    finally:
+        _FFMPEG_SLOTS.release()
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, output=stdout, stderr=stderr)
+    return stdout
+
+
+async def _run_ffmpeg_all(cmds: List[List[str]]) -> List[bytes]:
+    """Run ffmpeg commands concurrently (within the process-wide cap); outputs keep cmds' order.
+
+    Every process is waited for before the first failure is re-raised, so none are left running.
+    """
+    results = await asyncio.gather(*(_run_ffmpeg(cmd) for cmd in cmds), return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
+
 
 class Transcriber:
-    def __init__(self, model_name="whisper-1"):
+    def __init__(self, model_name="whisper-1", cache_dir=DEFAULT_CACHE_DIR):
         # Ensure OPENAI_API_KEY is set in environment
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise EnvironmentError("OPENAI_API_KEY environment variable is required.")
         openai.api_key = api_key
+        # One client for all requests so its connection pool (and TLS sessions) are reused
+        self._client = openai.OpenAI()
         self.model_name = model_name
         # Maximum allowed file size per request (20 MiB)
         self.max_bytes = 20 * 1024 * 1024
+        # Maximum number of uploads in flight, across all files transcribed concurrently
+        self.max_chunk_workers = 8
+        # Shared by every transcribe() call, so files processed in parallel (the CLI's --jobs)
+        # don't each get their own max_chunk_workers uploads and buffered chunks
+        self._upload_slots = threading.BoundedSemaphore(self.max_chunk_workers)
+        # Directory for cached transcriptions; None disables the cache
+        self.cache_dir = cache_dir
 
-    def _split_audio_into_chunks(self, audio_path: str) -> List[io.BytesIO]:
+    def _split_audio_into_chunks(self, audio_path: str, file_size: Optional[int] = None) -> Iterator[io.BytesIO]:
         """Split the input audio into chunks such that each chunk's exported size is <= max_bytes.
 
-        Returns a list of BytesIO objects (ready for reading from the start). If splitting fails,
-        raises an exception.
+        The audio is loaded eagerly (so load errors surface here), but chunks are encoded lazily:
+        the returned iterator yields one BytesIO at a time (ready for reading from the start),
+        which lets the caller upload and discard each chunk before the next is exported.
         """
-        file_size = os.path.getsize(audio_path)
+        if file_size is None:
+            file_size = os.path.getsize(audio_path)
         if file_size <= self.max_bytes:
             raise ValueError("File does not need splitting")
 
@@ -38,158 +145,287 @@ class Transcriber:
         if duration_ms <= 0:
             raise ValueError("Audio duration is zero")
 
-        # Estimate bytes per ms based on the original file size
-        bytes_per_ms = file_size / float(duration_ms)
-        # Compute max chunk duration in ms so each chunk will be <= max_bytes
-        max_ms_per_chunk = int(math.floor(self.max_bytes / bytes_per_ms))
-        # Safeguard: at least 1 second
-        if max_ms_per_chunk < 1000:
-            max_ms_per_chunk = 1000
-
-        chunks: List[io.BytesIO] = []
         # Determine export format from file extension
         _, ext = os.path.splitext(audio_path)
         ext = ext.lstrip('.').lower() or 'wav'
 
-        for i in range(0, duration_ms, max_ms_per_chunk):
-            chunk = audio[i:i + max_ms_per_chunk]
+        # Estimate the exported bit rate. WAV chunks are exported as raw PCM, so the frame
+        # parameters give the exact rate; other formats use the probed bit rate.
+        if ext == 'wav':
+            bits_per_second = audio.frame_rate * audio.frame_width * 8
+        else:
+            bits_per_second = self._probe_bit_rate(audio_path, file_size, duration_ms)
+        max_ms_per_chunk = self._max_chunk_ms(bits_per_second)
+
+        return self._export_chunks(audio, max_ms_per_chunk, ext)
+
+    def _probe_bit_rate(self, audio_path: str, file_size: int, duration_ms: int) -> int:
+        """Return the file's bit rate as reported by ffprobe, falling back to the file-size ratio
+        (which headers and variable bit rates skew)."""
+        try:
+            bits_per_second = int(self._ffprobe_format(audio_path, "bit_rate"))
+        except (OSError, subprocess.CalledProcessError, ValueError):
+            bits_per_second = 0
+        if bits_per_second <= 0:
+            # No usable bit rate (ffprobe missing or failed, "N/A", or 0)
+            bits_per_second = -(-file_size * 8 * 1000 // duration_ms)  # rounded up
+        return bits_per_second
+
+    def _max_chunk_ms(self, bits_per_second: int) -> int:
+        """Return the longest chunk duration in ms that stays under max_bytes at bits_per_second."""
+        # 10% headroom; integer arithmetic keeps this exact for multi-gigabyte inputs
+        max_ms_per_chunk = (self.max_bytes * 8 * 1000 * 9) // (bits_per_second * 10)
+        # Safeguard: at least 1 second
+        return max(1000, max_ms_per_chunk)
+
+    def _export_chunks(self, audio: AudioSegment, max_ms_per_chunk: int, ext: str) -> Iterator[io.BytesIO]:
+        """Yield consecutive `max_ms_per_chunk` slices of `audio`, each encoded into its own BytesIO.
+
+        Slices are zero-copy views into the decoded PCM buffer, cut on frame boundaries, instead of
+        the byte copies made by AudioSegment slicing.
+        """
+        pcm = memoryview(audio.raw_data)
+        bytes_per_chunk = (max_ms_per_chunk * audio.frame_rate // 1000) * audio.frame_width
+        for idx, start in enumerate(range(0, len(pcm), bytes_per_chunk)):
+            chunk = audio._spawn(pcm[start:start + bytes_per_chunk])
             bio = io.BytesIO()
             # pydub export will write encoded audio to the BytesIO
             chunk.export(bio, format=ext)
             bio.seek(0)
             # Give the BytesIO a name attribute so downstream libraries can infer filename
-            bio.name = f"part_{i // max_ms_per_chunk}.{ext}"
-            chunks.append(bio)
-
-        return chunks
+            bio.name = f"part_{idx}.{ext}"
+            yield bio
 
-    def _split_audio_by_duration(self, audio_path: str, chunk_ms: int) -> List[str]:
-        """Split the input .m4a audio into fixed-duration chunks (milliseconds).
+    def _split_audio_by_duration(self, audio_path: str, chunk_ms: int, file_size: Optional[int] = None) -> Iterator[io.BytesIO]:
+        """Split the input audio into fixed-duration chunks of at most chunk_ms, without re-encoding.
 
-        This writes each chunk to a temporary .m4a file and returns the list of file paths.
-        Using real files is necessary for reliable exporting/encoding of .m4a with ffmpeg.
+        A stream copy keeps the source bit rate, so for lossless (e.g. ALAC) or high bit-rate files
+        the chunks are shortened to stay under max_bytes, sized like `_split_audio_into_chunks`.
+        The duration and bit rate are probed eagerly (so probe errors surface here); the returned
+        iterator then runs one stream-copy ffmpeg per chunk and yields its stdout as a BytesIO, so
+        chunks never touch the disk. See `_pipe_segments` for how many are held in memory.
         """
-        # Load audio with pydub (specify format to ensure correct demuxing)
-        audio = AudioSegment.from_file(audio_path, format='m4a')
-        duration_ms = len(audio)
+        _, ext = os.path.splitext(audio_path)
+        ext = ext.lstrip('.').lower()
+        if ext not in _PIPE_FORMATS:
+            raise ValueError(f"Cannot stream-copy split '.{ext}' files")
+
+        duration_ms = int(float(self._ffprobe_format(audio_path, "duration")) * 1000)
         if duration_ms <= 0:
             raise ValueError("Audio duration is zero")
 
-        temp_paths: List[str] = []
-        # Export each chunk to a temporary .mp4 file
-        for i, start in enumerate(range(0, duration_ms, chunk_ms)):
-            end = start + chunk_ms
-            chunk = audio[start:end]
-            tmp = tempfile.NamedTemporaryFile(delete=False, suffix='.mp4')
-            tmp_path = tmp.name
-            tmp.close()
-            # Export chunk to the temp file path using ffmpeg
-            chunk.export(tmp_path, format='mp4')
-            temp_paths.append(tmp_path)
-
-        return temp_paths
-
-    def transcribe(self, audio_path: str) -> str:
+        if file_size is None:
+            file_size = os.path.getsize(audio_path)
+        chunk_ms = min(chunk_ms, self._max_chunk_ms(self._probe_bit_rate(audio_path, file_size, duration_ms)))
+        logger.info("Splitting by duration", extra={"details": {"audio_path": audio_path, "chunk_ms": chunk_ms}})
+        return self._pipe_segments(audio_path, duration_ms, chunk_ms, ext)
+
+    def _pipe_segments(self, audio_path: str, duration_ms: int, chunk_ms: int, ext: str) -> Iterator[io.BytesIO]:
+        """Yield consecutive `chunk_ms` segments of the file, stream-copied by ffmpeg to a pipe.
+
+        Segments are cut a window at a time (one window matches the upload concurrency), with the
+        window's ffmpeg processes running in parallel: stream copy is single-threaded, so this
+        spreads the demuxing across cores (at most one process per core across all files, see
+        `_FFMPEG_SLOTS`). A window is cut in full as soon as its first segment is requested, so
+        each file being split holds up to one window of segments waiting for an upload slot, on
+        top of the `max_chunk_workers` segments uploading across all files.
+        """
+        starts = list(range(0, duration_ms, chunk_ms))
+        window = self.max_chunk_workers
+        for first in range(0, len(starts), window):
+            cmds = [
+                [
+                    'ffmpeg', '-v', 'error',
+                    '-ss', f"{start / 1000:.3f}", '-t', f"{chunk_ms / 1000:.3f}", '-i', audio_path,
+                    '-vn', '-c', 'copy', *_PIPE_FORMATS[ext], 'pipe:1',
+                ]
+                for start in starts[first:first + window]
+            ]
+            outputs = asyncio.run(_run_ffmpeg_all(cmds))
+            for idx, data in enumerate(outputs, first):
+                # A variable bit rate can still push a segment over the limit; stop before uploading it
+                if len(data) > self.max_bytes:
+                    raise ValueError(f"Segment {idx} is {len(data)} bytes, over the {self.max_bytes}-byte limit")
+                bio = io.BytesIO(data)
+                # Give the BytesIO a name attribute so downstream libraries can infer filename
+                bio.name = f"part_{idx}.{ext}"
+                yield bio
+
+    def _ffprobe_format(self, audio_path: str, entry: str) -> str:
+        """Return a container-level property (e.g. "duration", "bit_rate") of the file via ffprobe."""
+        cmd = ['ffprobe', '-v', 'error', '-show_entries', f"format={entry}", '-of', 'default=nw=1:nk=1', audio_path]
+        return subprocess.run(cmd, stdin=subprocess.DEVNULL, check=True, capture_output=True, text=True).stdout.strip()
+
+    def _cache_path(self, audio_path: str) -> str:
+        """Return the cache file for audio_path, keyed by model name and a hash of the file contents.
+
+        The hash algorithm is part of the name, so installing or removing `blake3` can't make a
+        digest from one algorithm look up an entry written by the other.
+        """
+        algorithm, digest = hash_file(audio_path)
+        return os.path.join(self.cache_dir, self.model_name, f"{algorithm}-{digest}.txt")
+
+    def _write_cache(self, cache_path: str, text: str) -> None:
+        """Store a transcription atomically (temp file + os.replace) so readers never see partial files."""
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=os.path.dirname(cache_path), suffix='.tmp', delete=False) as tmp:
+                tmp.write(text)
+            os.replace(tmp.name, cache_path)
+            logger.info("Saved transcription to cache", extra={"details": {"cache_path": cache_path}})
+        except OSError as exc:
+            logger.warning("Failed to write transcription cache", extra={"details": {"cache_path": cache_path, "error": str(exc)}})
+
+    def _transcribe_chunk(self, client, audio_path: str, idx: int, chunk_item: io.BytesIO) -> str:
+        """Transcribe a single chunk produced by one of the split helpers.
+
+        The chunk's buffer is released as soon as the upload returns. Errors propagate to the
+        caller so it can record a placeholder for the failed part.
+        """
+        try:
+            chunk_item.seek(0)
+            resp = client.audio.transcriptions.create(file=chunk_item, model=self.model_name)
+        finally:
+            chunk_item.close()
+
+        part_text = getattr(resp, "text", "")
+        # Per-chunk hot path: don't build the details dict when INFO is disabled
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Chunk transcribed", extra={"details": {"audio_path": audio_path, "chunk_index": idx, "part_length": len(part_text)}})
+        return part_text
+
+    def transcribe(self, audio_path: str, size: Optional[int] = None) -> str:
         """
         Transcribe the audio at audio_path using OpenAI's Whisper (via openai-python).
         If the file is larger than 20 MB it will be split into multiple chunks and each chunk
         will be transcribed separately. The final transcription is the concatenation of parts
         in order.
+        `size` is the file size in bytes if the caller already knows it (e.g. from os.scandir);
+        otherwise the file is stat'ed.
         Returns the verbatim transcription as a string.
         """
-        client = openai.OpenAI()
+        client = self._client
 
-        try:
-            logger.info("Checking file size", {"audio_path": audio_path})
-            file_size = os.path.getsize(audio_path)
-            logger.info("File size checked", {"audio_path": audio_path, "size_bytes": file_size})
-        except OSError as e:
-            logger.error("Could not access file", {"audio_path": audio_path, "error": str(e)})
-            raise FileNotFoundError(f"Could not access file '{audio_path}': {e}")
+        if size is not None:
+            file_size = size
+        else:
+            try:
+                logger.info("Checking file size", extra={"details": {"audio_path": audio_path}})
+                file_size = os.path.getsize(audio_path)
+                logger.info("File size checked", extra={"details": {"audio_path": audio_path, "size_bytes": file_size}})
+            except OSError as e:
+                logger.error("Could not access file", extra={"details": {"audio_path": audio_path, "error": str(e)}})
+                raise FileNotFoundError(f"Could not access file '{audio_path}': {e}")
+
+        cache_path = self._cache_path(audio_path) if self.cache_dir else None
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as fh:
+                    text = fh.read()
+                logger.info("Loaded transcription from cache", extra={"details": {"audio_path": audio_path, "cache_path": cache_path, "transcript_length": len(text)}})
+                return text
+            except OSError as exc:
+                logger.warning("Failed to read cached transcription", extra={"details": {"cache_path": cache_path, "error": str(exc)}})
+
+        text, complete = self._transcribe_file(client, audio_path, file_size)
+        # Transcripts with failed chunks are not cached so a rerun retries them
+        if cache_path and complete:
+            self._write_cache(cache_path, text)
+        return text
+
+    def _transcribe_file(self, client, audio_path: str, file_size: int) -> Tuple[str, bool]:
+        """Upload the file (split into chunks if needed) and return (transcription, complete).
 
+        `complete` is False when one or more chunks failed and were replaced by an error placeholder.
+        """
         # If file is small enough, transcribe directly
-        logger.info("Starting transcription", {"audio_path": audio_path, "size_bytes": file_size})
+        logger.info("Starting transcription", extra={"details": {"audio_path": audio_path, "size_bytes": file_size}})
 
         if file_size <= self.max_bytes:
-            with open(audio_path, "rb") as audio_file:
+            with self._upload_slots, open(audio_path, "rb") as audio_file:
                 resp = client.audio.transcriptions.create(file=audio_file, model=self.model_name)
             text = getattr(resp, "text", "")
-            logger.info("Finished transcription", {"audio_path": audio_path, "size_bytes": file_size, "transcript_length": len(text)})
-            return text
+            logger.info("Finished transcription", extra={"details": {"audio_path": audio_path, "size_bytes": file_size, "transcript_length": len(text)}})
+            return text, True
 
         # Otherwise split into chunks and transcribe each
         _, ext = os.path.splitext(audio_path)
         ext = ext.lstrip('.').lower()
         try:
-            if ext == 'm4a':
-                # For m4a files, split by fixed duration (e.g., 5 minutes) to avoid encoding/size issues
-                chunk_ms = 5 * 60 * 1000  # 5 minutes
-                logger.info("Splitting .m4a by duration", {"audio_path": audio_path, "chunk_ms": chunk_ms})
-                chunks = self._split_audio_by_duration(audio_path, chunk_ms)
+            if ext in _PIPE_FORMATS:
+                # Compressed formats are split by duration (at most 5 minutes, less at high bit
+                # rates) with a stream copy, without decoding or re-encoding
+                chunks = self._split_audio_by_duration(audio_path, 5 * 60 * 1000, file_size)
             else:
-                chunks = self._split_audio_into_chunks(audio_path)
+                chunks = self._split_audio_into_chunks(audio_path, file_size)
         except Exception as exc:
-            logger.warning("Failed to split audio, falling back to full-file transcription", {"audio_path": audio_path, "error": str(exc)})
-            # Log traceback for debugging
-            import traceback
-            traceback.print_exc()
-            # If splitting fails for any reason, fall back to transcribing the whole file
-            with open(audio_path, "rb") as audio_file:
-                resp = client.audio.transcriptions.create(file=audio_file, model=self.model_name)
-            text = getattr(resp, "text", "")
-            logger.info("Finished transcription (fallback)", {"audio_path": audio_path, "size_bytes": file_size, "transcript_length": len(text)})
-            return text
+            return self._transcribe_unsplit(client, audio_path, file_size, exc)
 
+        logger.info("Transcribing chunks", extra={"details": {"audio_path": audio_path}})
+        # Chunk uploads are independent, so overlap them. The shared upload slots bound how many
+        # chunks are uploading at once across all files: the next chunk is only requested once an
+        # upload slot is free (duration splitting buffers up to one window ahead of that, see
+        # _pipe_segments).
+        futures: List[Future] = []
+        split_error: Optional[Exception] = None
+        with ThreadPoolExecutor(max_workers=self.max_chunk_workers) as executor:
+            try:
+                for idx, chunk_item in enumerate(chunks):
+                    self._upload_slots.acquire()
+                    future = executor.submit(self._transcribe_chunk, client, audio_path, idx, chunk_item)
+                    future.add_done_callback(lambda _: self._upload_slots.release())
+                    futures.append(future)
+            except Exception as exc:
+                # Chunks are produced lazily, so export/ffmpeg errors surface here; leaving the
+                # executor block still waits for the uploads already in flight
+                split_error = exc
+
+        if split_error is not None and not futures:
+            # Nothing was uploaded yet, so this is no different from failing to split up front
+            return self._transcribe_unsplit(client, audio_path, file_size, split_error)
+
+        # Re-assemble results in chunk order
         parts: List[str] = []
-        logger.info("Transcribing chunks", {"audio_path": audio_path, "num_chunks": len(chunks)})
-        for idx, chunk_item in enumerate(chunks):
-            part_text = ""
-            temp_file_to_delete = None
+        complete = True
+        for idx, future in enumerate(futures):
             try:
-                if isinstance(chunk_item, str):
-                    # chunk_item is a file path (from _split_audio_by_duration)
-                    temp_file_to_delete = chunk_item
-                    with open(chunk_item, 'rb') as fh:
-                        resp = client.audio.transcriptions.create(file=fh, model=self.model_name)
-                else:
-                    # Assume file-like object
-                    chunk_item.seek(0)
-                    resp = client.audio.transcriptions.create(file=chunk_item, model=self.model_name)
-
-                part_text = getattr(resp, "text", "")
-                logger.info("Chunk transcribed", {"audio_path": audio_path, "chunk_index": idx, "part_length": len(part_text)})
+                parts.append(future.result())
             except Exception as exc:
-                logger.error("Chunk transcription failed", {"audio_path": audio_path, "chunk_index": idx, "error": str(exc)})
-                part_text = f"[transcription error on part {idx}: {exc}]"
-            finally:
-                # Cleanup a temp file if we created one earlier
-                if temp_file_to_delete:
-                    try:
-                        os.remove(temp_file_to_delete)
-                        logger.info("Removed temporary chunk file", {"temp_path": temp_file_to_delete})
-                    except Exception:
-                        logger.warning("Failed to remove temporary chunk file", {"temp_path": temp_file_to_delete})
-
-            parts.append(part_text)
+                logger.error("Chunk transcription failed", extra={"details": {"audio_path": audio_path, "chunk_index": idx, "error": str(exc)}})
+                parts.append(f"[transcription error on part {idx}: {exc}]")
+                complete = False
+        if split_error is not None:
+            logger.error("Splitting failed partway through", extra={"details": {"audio_path": audio_path, "chunk_index": len(futures), "error": str(split_error)}})
+            parts.append(f"[transcription error on part {len(futures)} onwards: {split_error}]")
+            complete = False
 
         combined = "\n\n".join(parts)
-        logger.info("Finished transcription (chunks combined)", {"audio_path": audio_path, "size_bytes": file_size, "num_chunks": len(chunks), "transcript_length": len(combined)})
-        return combined
+        logger.info("Finished transcription (chunks combined)", extra={"details": {"audio_path": audio_path, "size_bytes": file_size, "num_chunks": len(parts), "transcript_length": len(combined)}})
+        return combined, complete
+
+    def _transcribe_unsplit(self, client, audio_path: str, file_size: int, split_error: Exception) -> Tuple[str, bool]:
+        """Fall back to uploading the whole file after splitting it failed."""
+        logger.warning("Failed to split audio, falling back to full-file transcription", extra={"details": {"audio_path": audio_path, "error": str(split_error)}})
+        # Log traceback for debugging
+        traceback.print_exception(type(split_error), split_error, split_error.__traceback__)
+        with self._upload_slots, open(audio_path, "rb") as audio_file:
+            resp = client.audio.transcriptions.create(file=audio_file, model=self.model_name)
+        text = getattr(resp, "text", "")
+        logger.info("Finished transcription (fallback)", extra={"details": {"audio_path": audio_path, "size_bytes": file_size, "transcript_length": len(text)}})
+        return text, True
 
     def enhance_transcription(self, transcription: str) -> str:
         """
         Improve readability: punctuation, capitalization, paragraphing while preserving meaning.
         """
-        # ...existing readability enhancement code...
-        prompt = (
-            "You will receive a verbatim transcript. Return the same content edited for readability: "
-            "add punctuation, capitalization, and paragraph breaks. Do not change meaning or add new information.\n\n"
-            f"Transcript:\n{transcription}\n\nOutput:"
-        )
-        client = openai.OpenAI()
+        prompt = _TRANSCRIPT_HEADER + transcription + _READABILITY_INSTRUCTIONS
+        client = self._client
         resp = client.chat.completions.create(
             model="gpt-4.1-mini",
-            messages=[{"role": "user", "content": prompt}],
+            messages=[
+                {"role": "system", "content": _ENHANCE_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
             temperature=0.0,
             max_tokens=2048,
         )
@@ -203,23 +439,47 @@ class Transcriber:
 
         Returns the interview-formatted text.
         """
-        prompt = (
-            "You are an assistant that reformats verbatim transcripts into a clear interview "
-            "between two people labeled 'Interviewer' and 'Interviewee'. Preserve the original "
-            "content and meaning exactly—do not invent, omit, or add facts. Improve readability "
-            "with punctuation, capitalization, and short paragraphs for each turn. Use the format:\n\n"
-            "Interviewer: <question or prompt>\n"
-            "Interviewee: <response>\n\n"
-            "If speaker identity is unclear, assign turns logically but do not attribute words to a "
-            "specific real person. Keep the tone neutral and faithful to the source.\n\n"
-            f"Transcript:\n{transcription}\n\nFormatted interview:"
-        )
+        prompt = _TRANSCRIPT_HEADER + transcription + _INTERVIEW_INSTRUCTIONS
 
-        client = openai.OpenAI()
+        client = self._client
         resp = client.chat.completions.create(
             model="gpt-4.1-mini",
-            messages=[{"role": "user", "content": prompt}],
+            messages=[
+                {"role": "system", "content": _ENHANCE_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
             temperature=0.0,
             max_tokens=2048,
         )
-        return getattr(resp.choices[0].message, "content", "").strip()
\ No newline at end of file
+        return getattr(resp.choices[0].message, "content", "").strip()
+
+    def enhance_both(self, transcription: str) -> Dict[str, str]:
+        """
+        Produce the readability-enhanced and the interview-formatted versions in one request,
+        so the transcript's input tokens are paid for once instead of twice.
+
+        Returns a dict with "enhanced" and "interview" keys. Raises ValueError if the model's
+        response is not a JSON object with both fields.
+        """
+        prompt = _TRANSCRIPT_HEADER + transcription + _COMBINED_INSTRUCTIONS
+
+        client = self._client
+        resp = client.chat.completions.create(
+            model="gpt-4.1-mini",
+            messages=[
+                {"role": "system", "content": _ENHANCE_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+            temperature=0.0,
+            # Room for both outputs
+            max_tokens=4096,
+            response_format={"type": "json_object"},
+        )
+        content = getattr(resp.choices[0].message, "content", "") or ""
+        try:
+            result = json.loads(content)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Combined enhancement response is not valid JSON: {exc}")
+        if not isinstance(result, dict) or not all(isinstance(result.get(key), str) for key in ("enhanced", "interview")):
+            raise ValueError("Combined enhancement response is missing the 'enhanced' or 'interview' field")
+        return {"enhanced": result["enhanced"].strip(), "interview": result["interview"].strip()}
\ No newline at end of file
@@ -1,4 +1,20 @@
+import hashlib
+import logging
 import os
+import queue
+import re
+import threading
+
+from logger import get_logger
+
+try:
+    import blake3  # optional: SIMD-accelerated hashing for transcription cache keys
+except ImportError:
+    blake3 = None
+
+logger = get_logger(__name__)
+
+_WHITESPACE_RE = re.compile(r'\s+')
 
 
 def validate_input_path(path):
@@ -10,9 +26,74 @@ def validate_input_path(path):
 
 def validate_output_path(path):
     """Validate if the output path exists or can be created."""
-    if not os.path.exists(path):
-        os.makedirs(path)
+    os.makedirs(path, exist_ok=True)
 
 def format_transcription(transcription):
-    """Format the transcription for better readability."""
-    return transcription.strip().replace('\n', ' ').replace('  ', ' ')
\ No newline at end of file
+    """Format the transcription for better readability: every whitespace run becomes one space."""
+    return _WHITESPACE_RE.sub(' ', transcription).strip()
+
+def hash_file(path, block_size=1024 * 1024):
+    """Return (algorithm, hex digest) of a file's contents, read in blocks so large files don't fill memory.
+
+    Uses BLAKE3 when the `blake3` package is installed, otherwise SHA-256 via `hashlib.file_digest`
+    (Python 3.11+, which can use the CPU's SHA extensions) or a plain block loop. Both digests are
+    64 hex characters, so callers that persist them should keep the algorithm alongside.
+    """
+    with open(path, 'rb') as fh:
+        if blake3 is not None:
+            algorithm, digest = 'blake3', blake3.blake3()
+        elif hasattr(hashlib, 'file_digest'):
+            return 'sha256', hashlib.file_digest(fh, 'sha256').hexdigest()
+        else:
+            algorithm, digest = 'sha256', hashlib.sha256()
+        for block in iter(lambda: fh.read(block_size), b''):
+            digest.update(block)
+    return algorithm, digest.hexdigest()
+
+
+class WriterPool:
+    """Write output files from a single background thread.
+
+    Workers hand over (path, bytes) with `submit` and move on; the writer thread writes each
+    payload with raw os.write calls (normally a single syscall) and logs each save. Call `join`
+    to flush everything before exiting.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="transcript-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, path, data, label="file", details=None):
+        """Queue `data` (bytes) to be written to `path`; `label` names the file in log messages."""
+        self._queue.put((path, data, label, details))
+
+    def join(self):
+        """Wait for all queued writes to finish and stop the writer thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while (item := self._queue.get()) is not None:
+            path, data, label, details = item
+            try:
+                _write_bytes(path, data)
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(f"Saved {label}", extra={"details": {"path": path, **(details or {})}})
+            except Exception as exc:
+                logger.error(f"Error saving {label}", extra={"details": {"path": path, "error": str(exc), **(details or {})}})
+
+
+def _write_bytes(path, data):
+    """Write `data` to `path` (created or truncated) without Python-level buffering.
+
+    New files get the same permissions open() would give them: 0o666 masked by the umask.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o666)
+    try:
+        view = memoryview(data)
+        # os.write may write less than asked (e.g. on signals or full pipes); finish the rest
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
@@ -0,0 +1,142 @@
+import os
+import shutil
+import sys
+import wave
+from unittest.mock import MagicMock, create_autospec, patch
+
+import pytest
+
+# Modules under src/ import each other as top-level modules (e.g. `from transcriber import ...`)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+
+@pytest.fixture(scope="module")
+def transcriber_spec():
+    """An autospecced Transcriber instance, built once per module, returning canned text.
+
+    Calls that do not match the real method signatures fail, so tests catch interface drift.
+    """
+    from src.transcriber import Transcriber
+
+    instance = create_autospec(Transcriber, instance=True)
+    instance.transcribe.return_value = "Transcription result"
+    instance.enhance_transcription.return_value = "Enhanced result"
+    instance.enhance_as_interview.return_value = "Interview result"
+    instance.enhance_both.return_value = {"enhanced": "Enhanced result", "interview": "Interview result"}
+    return instance
+
+
+@pytest.fixture(scope="module")
+def mock_transcriber_cls(transcriber_spec):
+    """A Transcriber class double whose instances are `transcriber_spec`.
+
+    Tests install it with monkeypatch and should reset its call history before use.
+    """
+    return MagicMock(return_value=transcriber_spec)
+
+
+@pytest.fixture(scope="session")
+def temp_input_folder(tmp_path_factory):
+    """An input folder holding one empty file per supported audio format, plus non-audio files
+    the CLI must skip, shared read-only by all tests."""
+    folder = tmp_path_factory.mktemp("audio")
+    for name in ("a.wav", "b.mp3", "c.m4a", "notes.txt", "cover.jpg"):
+        (folder / name).touch()
+    return folder
+
+
+@pytest.fixture(scope="session")
+def _audio_template(tmp_path_factory):
+    """Audio files written once per session; per-test fixtures copy them into their own tmp_path."""
+    folder = tmp_path_factory.mktemp("audio_tpl")
+    # A short silent WAV; the API is mocked, so its content is never decoded
+    with wave.open(str(folder / "sample.wav"), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(b"\x00\x00" * 1600)
+    return folder
+
+
+@pytest.fixture
+def mock_audio_file(tmp_path, _audio_template):
+    return str(shutil.copy(_audio_template / "sample.wav", tmp_path / "sample.wav"))
+
+
+@pytest.fixture
+def mock_large_audio_file(tmp_path):
+    """A sparse file just over the 20 MiB upload limit, as (path, size), so transcribe() takes the
+    chunked path.
+
+    Only its size is looked at, so it is truncated to length rather than written; creating it
+    per test costs no data I/O. Passing the size on to transcribe() skips the stat, as the CLI does.
+    """
+    size = 21 * 1024 * 1024
+    path = tmp_path / "large.wav"
+    with open(path, "wb") as fh:
+        os.ftruncate(fh.fileno(), size)
+    return str(path), size
+
+
+@pytest.fixture(scope="session")
+def cli_main():
+    """The CLI entry point, imported on first use so collection does not pay for the openai import."""
+    from src.cli import main
+    return main
+
+
+@pytest.fixture
+def invoke_cli(monkeypatch, cli_main):
+    """Run the CLI entry point as if invoked with the given command-line arguments."""
+    def _run(*args):
+        monkeypatch.setattr(sys, 'argv', ['cli.py', *map(str, args)])
+        cli_main()
+    return _run
+
+
+def _autospec_openai_client():
+    """An OpenAI client double whose API calls are checked against the real SDK signatures.
+
+    `audio` and `chat` are cached properties that autospec cannot see through, so the resource
+    objects the code calls into are specced individually.
+    """
+    import openai
+    from openai.resources.audio import Transcriptions
+    from openai.resources.chat import Completions
+
+    client = create_autospec(openai.OpenAI, instance=True)
+    client.audio.transcriptions = create_autospec(Transcriptions, instance=True)
+    client.chat.completions = create_autospec(Completions, instance=True)
+    return client
+
+
+@pytest.fixture(scope="session")
+def mock_openai_client():
+    """An OpenAI client double shared across the session; tests reset it and override return values."""
+    client = _autospec_openai_client()
+    client.audio.transcriptions.create.return_value = MagicMock(text="Transcription result")
+    client.chat.completions.create.return_value = MagicMock(choices=[MagicMock(message=MagicMock(content="Enhanced result"))])
+    return client
+
+
+@pytest.fixture(scope="session", autouse=True)
+def mock_env_openai_key():
+    """Provide a dummy API key for the whole session so Transcriber can be constructed; no test needs a real one."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv('OPENAI_API_KEY', 'test-key')
+        yield
+
+
+@pytest.fixture(scope="module")
+def patched_transcriber():
+    """A real Transcriber (cache disabled) wired to a mock OpenAI client, shared by a whole module.
+
+    Yields (transcriber, client); tests should reset the client and set the responses they need.
+    """
+    from src.transcriber import Transcriber
+
+    client = _autospec_openai_client()
+    client.audio.transcriptions.create.return_value = MagicMock(text="Transcription result")
+    client.chat.completions.create.return_value = MagicMock(choices=[MagicMock(message=MagicMock(content="Enhanced result"))])
+    with patch('src.transcriber.openai.OpenAI', return_value=client):
+        yield Transcriber(cache_dir=None), client
@@ -1,38 +1,142 @@
-import unittest
-from unittest.mock import patch, MagicMock
-import sys
 import os
-from src.cli import main
 
-class TestCLI(unittest.TestCase):
+import pytest
 
-    @patch('src.cli.Transcriber')
-    @patch('argparse.ArgumentParser.parse_args')
-    def test_main_with_valid_arguments(self, mock_parse_args, mock_transcriber):
-        mock_parse_args.return_value = MagicMock(input_folder='input', output_folder='output', enhance_for_reading=True)
-        mock_transcriber.return_value.transcribe.return_value = "Transcription result"
 
-        with patch('sys.stdout', new_callable=MagicMock()) as mock_stdout:
-            main()
-            mock_transcriber.assert_called_once_with('input', 'output', True)
-            mock_transcriber.return_value.transcribe.assert_called_once()
-            mock_stdout.write.assert_called_once_with("Transcription result\n")
+@pytest.fixture
+def cli_transcriber(monkeypatch, mock_transcriber_cls, transcriber_spec):
+    mock_transcriber_cls.reset_mock()
+    transcriber_spec.reset_mock()
+    monkeypatch.setattr('src.cli.Transcriber', mock_transcriber_cls)
+    return mock_transcriber_cls
 
-    @patch('src.cli.Transcriber')
-    @patch('argparse.ArgumentParser.parse_args')
-    def test_main_with_missing_input_folder(self, mock_parse_args, mock_transcriber):
-        mock_parse_args.return_value = MagicMock(input_folder=None, output_folder='output', enhance_for_reading=False)
 
-        with self.assertRaises(SystemExit):
-            main()
+@pytest.mark.parametrize("flags,expected_calls,expected_suffixes", [
+    ([], set(), {'_transcription.txt'}),
+    (['--enhance_for_reading'], {'enhance_transcription'}, {'_transcription.txt', '_enhanced.txt'}),
+    (['--format_as_interview'], {'enhance_as_interview'}, {'_transcription.txt', '_enhanced_interview.txt'}),
+    (['--enhance_for_reading', '--format_as_interview'], {'enhance_both'},
+     {'_transcription.txt', '_enhanced.txt', '_enhanced_interview.txt'}),
+])
+def test_main_flag_variants(cli_transcriber, invoke_cli, temp_input_folder, tmp_path, capsys,
+                            flags, expected_calls, expected_suffixes):
+    invoke_cli('--input_folder', temp_input_folder, '--output_folder', tmp_path, *flags)
 
-    @patch('src.cli.Transcriber')
-    @patch('argparse.ArgumentParser.parse_args')
-    def test_main_with_invalid_output_folder(self, mock_parse_args, mock_transcriber):
-        mock_parse_args.return_value = MagicMock(input_folder='input', output_folder=None, enhance_for_reading=False)
+    cli_transcriber.assert_called_once()
+    instance = cli_transcriber.return_value
+    assert instance.transcribe.call_count == 3
+    for name in ('enhance_transcription', 'enhance_as_interview', 'enhance_both'):
+        assert (getattr(instance, name).call_count == 3) == (name in expected_calls), name
+    expected_outputs = {stem + suffix for stem in ('a', 'b', 'c') for suffix in expected_suffixes}
+    assert {path.name for path in tmp_path.iterdir()} == expected_outputs
+    # Progress is reported through the logger, never printed
+    assert capsys.readouterr().out == ""
 
-        with self.assertRaises(SystemExit):
-            main()
 
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+def test_main_only_transcribes_audio_files(cli_transcriber, invoke_cli, temp_input_folder, tmp_path):
+    from src.cli import _AUDIO_EXTS
+
+    invoke_cli('--input_folder', temp_input_folder, '--output_folder', tmp_path)
+
+    transcribed = {os.path.basename(call.args[0]) for call in cli_transcriber.return_value.transcribe.call_args_list}
+    assert transcribed == {'a.wav', 'b.mp3', 'c.m4a'}
+    assert {os.path.splitext(name)[1] for name in transcribed} <= _AUDIO_EXTS
+
+
+def test_main_output_filename_conventions(cli_transcriber, invoke_cli, tmp_path):
+    input_folder = tmp_path / 'input'
+    input_folder.mkdir()
+    (input_folder / 'team.sync.M4A').touch()
+    invoke_cli('--input_folder', input_folder, '--output_folder', tmp_path / 'output',
+               '--enhance_for_reading', '--format_as_interview')
+
+    # Only the final extension is dropped from the output name
+    outputs = {path.name: path.read_text() for path in (tmp_path / 'output').iterdir()}
+    assert outputs == {
+        'team.sync_transcription.txt': "Transcription result",
+        'team.sync_enhanced.txt': "Enhanced result",
+        'team.sync_enhanced_interview.txt': "Interview result",
+    }
+
+
+def test_main_falls_back_to_separate_enhancements(cli_transcriber, transcriber_spec, invoke_cli, mock_audio_file,
+                                                  tmp_path, monkeypatch):
+    monkeypatch.setattr(transcriber_spec.enhance_both, 'side_effect', ValueError("not valid JSON"))
+    invoke_cli('--input_folder', os.path.dirname(mock_audio_file), '--output_folder', tmp_path / 'output',
+               '--enhance_for_reading', '--format_as_interview')
+
+    transcriber_spec.enhance_both.assert_called_once_with("Transcription result")
+    transcriber_spec.enhance_transcription.assert_called_once_with("Transcription result")
+    transcriber_spec.enhance_as_interview.assert_called_once_with("Transcription result")
+    assert (tmp_path / 'output' / 'sample_enhanced.txt').read_text() == "Enhanced result"
+    assert (tmp_path / 'output' / 'sample_enhanced_interview.txt').read_text() == "Interview result"
+
+
+def _fail_on_b_mp3(audio_path, size=None):
+    if os.path.basename(audio_path) == 'b.mp3':
+        raise Exception('File corrupted')
+    return "Transcription result"
+
+
+@pytest.mark.parametrize("flags,expected_suffixes", [
+    ([], {'_transcription.txt'}),
+    (['--enhance_for_reading'], {'_transcription.txt', '_enhanced.txt'}),
+])
+def test_main_resilient_to_individual_file_failures(cli_transcriber, transcriber_spec, invoke_cli, temp_input_folder,
+                                                    tmp_path, monkeypatch, flags, expected_suffixes):
+    monkeypatch.setattr(transcriber_spec.transcribe, 'side_effect', _fail_on_b_mp3)
+    invoke_cli('--input_folder', temp_input_folder, '--output_folder', tmp_path, *flags)
+
+    assert transcriber_spec.transcribe.call_count == 3
+    assert {path.name for path in tmp_path.iterdir()} == {stem + suffix for stem in ('a', 'c') for suffix in expected_suffixes}
+
+
+@pytest.fixture
+def openai_client(monkeypatch, mock_openai_client):
+    mock_openai_client.reset_mock()
+    monkeypatch.setattr('openai.OpenAI', lambda *args, **kwargs: mock_openai_client)
+    return mock_openai_client
+
+
+@pytest.mark.integration
+def test_full_transcription_pipeline(openai_client, invoke_cli, temp_input_folder, tmp_path):
+    openai_client.audio.transcriptions.create.return_value.text = "Hello from the meeting"
+    invoke_cli('--input_folder', temp_input_folder, '--output_folder', tmp_path, '--no-cache')
+
+    uploaded = {os.path.basename(call.kwargs['file'].name) for call in openai_client.audio.transcriptions.create.call_args_list}
+    assert uploaded == {'a.wav', 'b.mp3', 'c.m4a'}
+    openai_client.chat.completions.create.assert_not_called()
+    assert (tmp_path / 'a_transcription.txt').read_text() == "Hello from the meeting"
+
+
+@pytest.mark.integration
+def test_transcription_with_enhancement_pipeline(openai_client, invoke_cli, temp_input_folder, tmp_path):
+    openai_client.audio.transcriptions.create.return_value.text = "hello from the meeting"
+    openai_client.chat.completions.create.return_value.choices[0].message.content = "Hello from the meeting."
+    invoke_cli('--input_folder', temp_input_folder, '--output_folder', tmp_path, '--no-cache', '--enhance_for_reading')
+
+    messages = openai_client.chat.completions.create.call_args.kwargs['messages']
+    assert "hello from the meeting" in messages[-1]['content']
+    assert (tmp_path / 'b_enhanced.txt').read_text() == "Hello from the meeting."
+
+
+@pytest.mark.integration
+def test_transcription_with_interview_format_pipeline(openai_client, invoke_cli, mock_audio_file, tmp_path):
+    openai_client.audio.transcriptions.create.return_value.text = "so how did you start"
+    openai_client.chat.completions.create.return_value.choices[0].message.content = "Interviewer: So, how did you start?"
+    invoke_cli('--input_folder', os.path.dirname(mock_audio_file), '--output_folder', tmp_path / 'output', '--no-cache', '--format_as_interview')
+
+    uploaded = openai_client.audio.transcriptions.create.call_args.kwargs['file']
+    assert uploaded.name == mock_audio_file
+    assert (tmp_path / 'output' / 'sample_enhanced_interview.txt').read_text() == "Interviewer: So, how did you start?"
+
+
+@pytest.mark.parametrize("args", [
+    pytest.param([], id="missing args"),
+    pytest.param(['--output_folder', 'output'], id="no input"),
+    pytest.param(['--input_folder', 'input'], id="no output"),
+    pytest.param(['--input_folder', 'input', '--output_folder', 'output', '--jobs', '0'], id="jobs below one"),
+])
+def test_main_rejects_invalid_arguments(invoke_cli, args):
+    with pytest.raises(SystemExit):
+        invoke_cli(*args)
@@ -0,0 +1,158 @@
+import logging
+
+import pytest
+
+from src import logger as logger_module
+from src.logger import JsonDetailsFormatter, _serialize_details, get_logger
+
+
+@pytest.fixture(autouse=True, scope="module")
+def _cleanup_loggers():
+    """Drop the loggers these tests create so they do not linger in the logging manager."""
+    yield
+    manager = logging.Logger.manager
+    for name in list(manager.loggerDict):
+        if name.startswith("test_") or name == "integration_test":
+            logger = manager.loggerDict.pop(name)
+            for handler in getattr(logger, "handlers", []):
+                handler.close()
+
+
+@pytest.fixture(scope="class")
+def formatter():
+    return JsonDetailsFormatter()
+
+
+@pytest.fixture(scope="class")
+def record():
+    """One LogRecord per class; tests overwrite the fields the formatter reads."""
+    return logging.LogRecord("test", logging.INFO, "", 0, "", (), None)
+
+
+def _circular():
+    details = {}
+    details["self"] = details
+    return details
+
+
+CASES = [
+    ("with_details", logging.INFO, "Test message", {"key": "value", "count": 42},
+     'INFO: Test message | {"key":"value","count":42}'),
+    ("without_details", logging.WARNING, "Warning message", None,
+     "WARNING: Warning message | {}"),
+    ("complex_details", logging.ERROR, "Complex message",
+     {"nested": {"list": [1, 2, 3]}, "path": "a/b.wav", "text": "café"},
+     'ERROR: Complex message | {"nested":{"list":[1,2,3]},"path":"a/b.wav","text":"café"}'),
+    ("unserializable_details", logging.INFO, "Circular message", _circular(),
+     'INFO: Circular message | {"error":"could not serialize details"}'),
+]
+
+
+class TestJsonDetailsFormatter:
+
+    @pytest.mark.parametrize("name,level,msg,details,expected", CASES, ids=[case[0] for case in CASES])
+    def test_format(self, formatter, record, name, level, msg, details, expected):
+        record.levelname = logging.getLevelName(level)
+        record.msg = msg
+        record.details = details
+        assert formatter.format(record) == expected
+
+
+class TestSerializeDetails:
+
+    @pytest.mark.parametrize("use_orjson", [True, False], ids=["orjson", "stdlib"])
+    @pytest.mark.parametrize("details,expected", [
+        (None, "{}"),
+        ({"error": "File not found", "file": "test.txt"}, '{"error":"File not found","file":"test.txt"}'),
+        ({"path": "a/b.wav", "text": "café"}, '{"path":"a/b.wav","text":"café"}'),
+        ({"size": 1.5, "ok": True, "missing": None}, '{"size":1.5,"ok":true,"missing":null}'),
+        (_circular(), '{"error":"could not serialize details"}'),
+    ], ids=["none", "flat", "non_ascii", "scalars", "circular"])
+    def test_serialize_details(self, monkeypatch, use_orjson, details, expected):
+        if use_orjson:
+            if logger_module.orjson is None:
+                pytest.skip("orjson is not installed")
+        else:
+            monkeypatch.setattr(logger_module, "orjson", None)
+        assert _serialize_details(details) == expected
+
+
+class TestConvenienceFunctions:
+
+    @pytest.mark.parametrize("func,level", [
+        (logger_module.info, logging.INFO),
+        (logger_module.warning, logging.WARNING),
+        (logger_module.error, logging.ERROR),
+    ])
+    def test_function_logs_message_and_details(self, caplog, func, level):
+        func("Test message", {"key": "value"})
+        record = caplog.records[-1]
+        assert record.getMessage() == "Test message"
+        assert record.levelno == level
+        assert record.details == {"key": "value"}
+
+    def test_functions_with_none_details(self, caplog):
+        logger_module.info("Info message")
+        logger_module.warning("Warning message")
+        logger_module.error("Error message")
+        assert [(record.getMessage(), record.details) for record in caplog.records] == [
+            ("Info message", None), ("Warning message", None), ("Error message", None),
+        ]
+
+
+class TestGetLogger:
+
+    def test_repeated_calls_add_one_handler(self):
+        logger = get_logger("test_duplicate")
+        assert get_logger("test_duplicate") is logger
+        assert len(logger.handlers) == 1
+        assert isinstance(logger.handlers[0].formatter, JsonDetailsFormatter)
+        assert logger.level == logging.INFO
+
+
+class _ListHandler(logging.Handler):
+    """Collects records in memory so tests can inspect log output without capturing stderr."""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def log_sink():
+    handler = _ListHandler()
+    logger = get_logger("integration_test")
+    logger.addHandler(handler)
+    yield handler.records
+    logger.removeHandler(handler)
+
+
+class TestLoggerIntegration:
+
+    def test_logger_outputs_correct_format(self, log_sink, formatter):
+        get_logger("integration_test").info("Starting transcription", extra={"details": {"file": "a.wav", "size_bytes": 12345}})
+        assert [formatter.format(record) for record in log_sink] == [
+            'INFO: Starting transcription | {"file":"a.wav","size_bytes":12345}',
+        ]
+
+    def test_mapping_args_still_format_placeholders(self, log_sink, formatter):
+        get_logger("integration_test").info("x %(a)s", {"a": 1})
+        assert [formatter.format(record) for record in log_sink] == ["INFO: x 1 | {}"]
+
+    def test_percent_in_message_keeps_details(self, log_sink, formatter):
+        get_logger("integration_test").info("Done 100%", extra={"details": {"files": 3}})
+        assert [formatter.format(record) for record in log_sink] == ['INFO: Done 100% | {"files":3}']
+
+    def test_multiple_log_calls(self, log_sink, formatter):
+        logger = get_logger("integration_test")
+        logger.info("First", extra={"details": {"step": 1}})
+        logger.warning("Second")
+        logger.error("Third", extra={"details": {"step": 3}})
+        assert [formatter.format(record) for record in log_sink] == [
+            'INFO: First | {"step":1}',
+            "WARNING: Second | {}",
+            'ERROR: Third | {"step":3}',
+        ]
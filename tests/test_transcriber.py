@@ -1,28 +1,441 @@
-import unittest
-from src.transcriber import Transcriber
-
-class TestTranscriber(unittest.TestCase):
-
-    def setUp(self):
-        self.transcriber = Transcriber()
-
-    def test_transcribe_audio(self):
-        # Assuming there's a sample audio file for testing
-        audio_file = 'tests/sample_audio.wav'
-        transcription = self.transcriber.transcribe(audio_file)
-        self.assertIsInstance(transcription, str)
-        self.assertGreater(len(transcription), 0)
-
-    def test_transcribe_nonexistent_audio(self):
-        with self.assertRaises(FileNotFoundError):
-            self.transcriber.transcribe('nonexistent_file.wav')
-
-    def test_enhanced_readability(self):
-        audio_file = 'tests/sample_audio.wav'
-        transcription = self.transcriber.transcribe(audio_file)
-        enhanced_transcription = self.transcriber.enhance_for_reading(transcription)
-        self.assertIsInstance(enhanced_transcription, str)
-        self.assertNotEqual(transcription, enhanced_transcription)
-
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+import asyncio
+import io
+import logging
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+class _NamedBytesIO(io.BytesIO):
+    """An in-memory chunk named like the ones the split helpers produce."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, data, name):
+        super().__init__(data)
+        self.name = name
+
+
+@pytest.fixture
+def transcriber_client(patched_transcriber):
+    """The module's shared (transcriber, client) pair with the client's call history cleared."""
+    transcriber, client = patched_transcriber
+    client.reset_mock()
+    client.audio.transcriptions.create.side_effect = None
+    return transcriber, client
+
+
+def test_transcribe_audio(transcriber_client, mock_audio_file):
+    transcriber, client = transcriber_client
+    client.audio.transcriptions.create.return_value.text = "Hello world"
+    assert transcriber.transcribe(mock_audio_file) == "Hello world"
+    client.audio.transcriptions.create.assert_called_once()
+
+
+def test_transcribe_logs_details(transcriber_client, mock_audio_file, caplog):
+    transcriber, client = transcriber_client
+    client.audio.transcriptions.create.return_value.text = "Hello world"
+    with caplog.at_level(logging.INFO):
+        transcriber.transcribe(mock_audio_file, size=100)
+
+    finished = next(record for record in caplog.records if record.getMessage() == "Finished transcription")
+    assert finished.details == {"audio_path": mock_audio_file, "size_bytes": 100, "transcript_length": 11}
+
+
+def test_transcribe_large_file_with_chunks(transcriber_client, mock_large_audio_file):
+    transcriber, client = transcriber_client
+    chunks = iter([_NamedBytesIO(b"part one", "part_0.wav"), _NamedBytesIO(b"part two", "part_1.wav")])
+    uploaded = []
+
+    def create(file, model):
+        uploaded.append(file.name)
+        return MagicMock(text=file.read().decode())
+
+    client.audio.transcriptions.create.side_effect = create
+    path, size = mock_large_audio_file
+    with patch.object(transcriber, '_split_audio_into_chunks', return_value=chunks) as split:
+        transcription = transcriber.transcribe(path, size=size)
+
+    split.assert_called_once_with(path, size)
+    assert sorted(uploaded) == ["part_0.wav", "part_1.wav"]
+    assert transcription == "part one\n\npart two"
+
+
+def _echo_upload(file, model):
+    return MagicMock(text=file.read().decode())
+
+
+@pytest.fixture
+def large_m4a(mock_large_audio_file):
+    """The large sparse file as an .m4a, so transcribe() splits it with stream-copy ffmpeg."""
+    wav_path, size = mock_large_audio_file
+    path = os.path.splitext(wav_path)[0] + ".m4a"
+    os.rename(wav_path, path)
+    return path, size
+
+
+@pytest.fixture
+def failing_ffmpeg(transcriber_client, monkeypatch):
+    """Stub the ffmpeg side of duration splitting: a 20-minute file cut in windows of two
+    5-minute segments, where every window starting at or after `fail_from_ms` fails."""
+    transcriber, _ = transcriber_client
+    monkeypatch.setattr(transcriber, 'max_chunk_workers', 2)
+    monkeypatch.setattr(transcriber, '_ffprobe_format', lambda audio_path, entry: "1200")
+
+    def install(fail_from_ms):
+        async def run_ffmpeg_all(cmds):
+            starts = [float(cmd[cmd.index('-ss') + 1]) * 1000 for cmd in cmds]
+            if starts[0] >= fail_from_ms:
+                raise subprocess.CalledProcessError(1, 'ffmpeg')
+            return [f"segment {int(start) // 300000}".encode() for start in starts]
+        monkeypatch.setattr('src.transcriber._run_ffmpeg_all', run_ffmpeg_all)
+    return install
+
+
+def test_transcribe_keeps_uploaded_parts_when_splitting_fails_midway(transcriber_client, large_m4a, failing_ffmpeg):
+    transcriber, client = transcriber_client
+    failing_ffmpeg(fail_from_ms=600000)
+    client.audio.transcriptions.create.side_effect = _echo_upload
+    path, size = large_m4a
+
+    transcription = transcriber.transcribe(path, size=size)
+
+    assert client.audio.transcriptions.create.call_count == 2
+    assert transcription.startswith("segment 0\n\nsegment 1\n\n[transcription error on part 2 onwards: ")
+
+
+def test_transcribe_falls_back_to_whole_file_when_first_segments_fail(transcriber_client, large_m4a, failing_ffmpeg):
+    transcriber, client = transcriber_client
+    failing_ffmpeg(fail_from_ms=0)
+    client.audio.transcriptions.create.return_value.text = "Whole file"
+    path, size = large_m4a
+
+    assert transcriber.transcribe(path, size=size) == "Whole file"
+    client.audio.transcriptions.create.assert_called_once()
+    assert client.audio.transcriptions.create.call_args.kwargs['file'].name == path
+
+
+@pytest.fixture
+def probed_m4a(transcriber_client, monkeypatch):
+    """Stub a 20-minute m4a probed at `bit_rate`, whose segments are recorded instead of cut by
+    ffmpeg; each fake segment is `segment_bytes` long. Returns (transcriber, recorded commands)."""
+    transcriber, _ = transcriber_client
+    cut = []
+
+    def install(bit_rate, segment_bytes=10):
+        probe = {"duration": "1200", "bit_rate": bit_rate}
+        monkeypatch.setattr(transcriber, '_ffprobe_format', lambda audio_path, entry: probe[entry])
+
+        async def run_ffmpeg_all(cmds):
+            cut.extend(cmds)
+            return [bytes(segment_bytes) for _ in cmds]
+        monkeypatch.setattr('src.transcriber._run_ffmpeg_all', run_ffmpeg_all)
+        return transcriber, cut
+    return install
+
+
+@pytest.mark.parametrize("bit_rate, segment_seconds, count", [
+    ("128000", "300.000", 4),  # AAC: the 5-minute cap applies
+    ("1411200", "106.997", 12),  # ALAC at CD quality: 5 minutes would be ~50 MB
+])
+def test_split_by_duration_shortens_segments_for_high_bit_rates(probed_m4a, bit_rate, segment_seconds, count):
+    transcriber, cut = probed_m4a(bit_rate)
+
+    chunks = list(transcriber._split_audio_by_duration('talk.m4a', 5 * 60 * 1000, file_size=30 * 1024 * 1024))
+
+    assert len(chunks) == len(cut) == count
+    assert {cmd[cmd.index('-t') + 1] for cmd in cut} == {segment_seconds}
+
+
+def test_split_by_duration_rejects_oversized_segments(probed_m4a, monkeypatch):
+    transcriber, _ = probed_m4a("128000", segment_bytes=1001)
+    monkeypatch.setattr(transcriber, 'max_bytes', 1000)
+
+    with pytest.raises(ValueError, match="over the 1000-byte limit"):
+        next(transcriber._split_audio_by_duration('talk.m4a', 5 * 60 * 1000, file_size=30 * 1024 * 1024))
+
+
+def test_ffmpeg_slots_are_shared_across_event_loops(monkeypatch):
+    """Files split on separate threads (each with its own loop) share one ffmpeg cap."""
+    from src import transcriber as transcriber_module
+
+    monkeypatch.setattr(transcriber_module, '_FFMPEG_SLOTS', threading.BoundedSemaphore(2))
+    running, peak, lock = 0, 0, threading.Lock()
+    stdins = []
+
+    async def fake_exec(*cmd, stdin, stdout, stderr):
+        nonlocal running, peak
+        stdins.append(stdin)
+        with lock:
+            running += 1
+            peak = max(peak, running)
+
+        async def communicate():
+            nonlocal running
+            await asyncio.sleep(0.01)
+            with lock:
+                running -= 1
+            return b"out", b""
+        return SimpleNamespace(communicate=communicate, returncode=0)
+
+    monkeypatch.setattr(transcriber_module.asyncio, 'create_subprocess_exec', fake_exec)
+    cmds = [['ffmpeg', str(idx)] for idx in range(4)]
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        results = list(executor.map(lambda _: asyncio.run(transcriber_module._run_ffmpeg_all(cmds)), range(3)))
+
+    assert results == [[b"out"] * 4] * 3
+    assert peak == 2
+    assert set(stdins) == {asyncio.subprocess.DEVNULL}
+
+
+@pytest.fixture
+def cached_transcriber(transcriber_client, tmp_path, monkeypatch):
+    """The shared transcriber with its cache enabled under tmp_path."""
+    transcriber, client = transcriber_client
+    monkeypatch.setattr(transcriber, 'cache_dir', str(tmp_path / "cache"))
+    return transcriber, client
+
+
+def test_transcribe_cache_hit_skips_api(cached_transcriber, mock_audio_file):
+    transcriber, client = cached_transcriber
+    cache_path = transcriber._cache_path(mock_audio_file)
+    os.makedirs(os.path.dirname(cache_path))
+    with open(cache_path, 'w', encoding='utf-8') as fh:
+        fh.write("Cached text")
+
+    assert transcriber.transcribe(mock_audio_file) == "Cached text"
+    client.audio.transcriptions.create.assert_not_called()
+
+
+def test_transcribe_cache_miss_writes_entry_atomically(cached_transcriber, mock_audio_file, monkeypatch):
+    transcriber, client = cached_transcriber
+    client.audio.transcriptions.create.return_value.text = "Fresh text"
+    replaced = []
+    real_replace = os.replace
+
+    def spy_replace(src, dst):
+        replaced.append((src, dst))
+        real_replace(src, dst)
+
+    monkeypatch.setattr('src.transcriber.os.replace', spy_replace)
+    assert transcriber.transcribe(mock_audio_file) == "Fresh text"
+
+    cache_path = transcriber._cache_path(mock_audio_file)
+    # Written to a temp file beside the entry, then renamed into place
+    [(src, dst)] = replaced
+    assert dst == cache_path
+    assert os.path.dirname(src) == os.path.dirname(cache_path) and src.endswith('.tmp')
+    assert os.listdir(os.path.dirname(cache_path)) == [os.path.basename(cache_path)]
+    with open(cache_path, encoding='utf-8') as fh:
+        assert fh.read() == "Fresh text"
+
+
+def test_transcribe_cache_key_includes_model_name(cached_transcriber, mock_audio_file, monkeypatch):
+    transcriber, client = cached_transcriber
+    whisper_path = transcriber._cache_path(mock_audio_file)
+    transcriber.transcribe(mock_audio_file)
+
+    monkeypatch.setattr(transcriber, 'model_name', 'other-model')
+    assert transcriber._cache_path(mock_audio_file) != whisper_path
+    transcriber.transcribe(mock_audio_file)
+    assert client.audio.transcriptions.create.call_count == 2
+
+
+def test_transcribe_cache_key_includes_hash_algorithm(cached_transcriber, mock_audio_file, monkeypatch):
+    transcriber, client = cached_transcriber
+    digest = "ab" * 32
+    monkeypatch.setattr('src.transcriber.hash_file', lambda path: ("sha256", digest))
+    sha256_path = transcriber._cache_path(mock_audio_file)
+    transcriber.transcribe(mock_audio_file)
+
+    # Same digest from the other algorithm (blake3 installed since): a miss, not the SHA-256 entry
+    monkeypatch.setattr('src.transcriber.hash_file', lambda path: ("blake3", digest))
+    assert os.path.basename(sha256_path) == f"sha256-{digest}.txt"
+    assert os.path.basename(transcriber._cache_path(mock_audio_file)) == f"blake3-{digest}.txt"
+    transcriber.transcribe(mock_audio_file)
+    assert client.audio.transcriptions.create.call_count == 2
+
+
+def test_transcribe_does_not_cache_incomplete_transcript(cached_transcriber, mock_audio_file):
+    transcriber, _ = cached_transcriber
+    with patch.object(transcriber, '_transcribe_file', return_value=("partial [transcription error on part 1: boom]", False)):
+        transcriber.transcribe(mock_audio_file)
+
+    assert not os.path.exists(transcriber._cache_path(mock_audio_file))
+
+
+def test_transcribe_nonexistent_audio(transcriber_client):
+    transcriber, _ = transcriber_client
+    with pytest.raises(FileNotFoundError):
+        transcriber.transcribe('nonexistent_file.wav')
+
+
+def test_split_audio_creates_chunks(transcriber_client, monkeypatch):
+    transcriber, _ = transcriber_client
+    # 1 s minimum chunk at 16 kHz, 16-bit mono -> 32000-byte slices of the 80000-byte PCM buffer
+    monkeypatch.setattr(transcriber, 'max_bytes', 1000)
+    raw_data = bytes(range(256)) * 312 + bytes(128)
+
+    def spawn(data):
+        # Plain callables rather than mocks: export just writes the slice it was given
+        return SimpleNamespace(export=lambda out, format: out.write(bytes(data)))
+
+    audio = MagicMock(raw_data=raw_data, frame_rate=16000, frame_width=2, _spawn=spawn)
+    audio.__len__.return_value = 2500
+    with patch('src.transcriber.AudioSegment.from_file', return_value=audio):
+        chunks = list(transcriber._split_audio_into_chunks('meeting.wav', file_size=2000))
+
+    assert [chunk.name for chunk in chunks] == ['part_0.wav', 'part_1.wav', 'part_2.wav']
+    assert [len(chunk.getvalue()) for chunk in chunks] == [32000, 32000, 16000]
+    assert b"".join(chunk.read() for chunk in chunks) == raw_data
+
+
+@pytest.fixture
+def export_spy(transcriber_client, monkeypatch):
+    """Record the chunk duration `_split_audio_into_chunks` hands to `_export_chunks` for a 10-minute mp3."""
+    transcriber, _ = transcriber_client
+    spy = MagicMock(return_value=iter(()))
+    monkeypatch.setattr(transcriber, '_export_chunks', spy)
+    audio = MagicMock(frame_rate=44100, frame_width=4)
+    audio.__len__.return_value = 600000
+    with patch('src.transcriber.AudioSegment.from_file', return_value=audio):
+        yield transcriber, spy, audio
+
+
+@pytest.mark.parametrize("bit_rate, expected_ms", [
+    ("128000", 1179648),  # 20 MiB * 8 bits * 0.9 headroom at 128 kb/s
+    ("10000000000", 1000),  # absurd bit rate: clamped to the 1 s floor
+])
+def test_split_audio_sizes_chunks_from_ffprobe_bit_rate(export_spy, monkeypatch, bit_rate, expected_ms):
+    transcriber, spy, audio = export_spy
+    probe = MagicMock(return_value=bit_rate)
+    monkeypatch.setattr(transcriber, '_ffprobe_format', probe)
+    transcriber._split_audio_into_chunks('meeting.mp3', file_size=30 * 1024 * 1024)
+
+    probe.assert_called_once_with('meeting.mp3', 'bit_rate')
+    spy.assert_called_once_with(audio, expected_ms, 'mp3')
+
+
+@pytest.mark.parametrize("probe_result", [
+    "N/A",
+    "0",
+    subprocess.CalledProcessError(1, "ffprobe"),
+    FileNotFoundError("ffprobe"),
+], ids=["n/a", "zero", "ffprobe-failed", "ffprobe-missing"])
+def test_split_audio_falls_back_to_file_size_bit_rate(export_spy, monkeypatch, probe_result):
+    transcriber, spy, audio = export_spy
+    if isinstance(probe_result, Exception):
+        probe = MagicMock(side_effect=probe_result)
+    else:
+        probe = MagicMock(return_value=probe_result)
+    monkeypatch.setattr(transcriber, '_ffprobe_format', probe)
+    transcriber._split_audio_into_chunks('meeting.mp3', file_size=30 * 1024 * 1024)
+
+    # 30 MiB over 600 s is 419431 b/s (rounded up), so 20 MiB * 0.9 lasts 359999 ms
+    spy.assert_called_once_with(audio, 359999, 'mp3')
+
+
+def test_transcribe_keeps_uploaded_parts_when_export_fails_midway(transcriber_client, mock_large_audio_file, monkeypatch):
+    transcriber, client = transcriber_client
+    # 1 s chunks at 16 kHz, 16-bit mono: three slices, the last of which fails to encode
+    monkeypatch.setattr(transcriber, 'max_bytes', 1000)
+    raw_data = b"a" * 32000 + b"b" * 32000 + b"c" * 16000
+
+    def export(data, out, format):
+        if data[:1] == b"c":
+            raise OSError("encoder crashed")
+        out.write(data[:1])
+
+    def spawn(data):
+        return SimpleNamespace(export=lambda out, format: export(bytes(data), out, format))
+
+    audio = MagicMock(raw_data=raw_data, frame_rate=16000, frame_width=2, _spawn=spawn)
+    audio.__len__.return_value = 2500
+    client.audio.transcriptions.create.side_effect = _echo_upload
+    path, size = mock_large_audio_file
+    with patch('src.transcriber.AudioSegment.from_file', return_value=audio):
+        transcription = transcriber.transcribe(path, size=size)
+
+    assert client.audio.transcriptions.create.call_count == 2
+    assert transcription == "a\n\nb\n\n[transcription error on part 2 onwards: encoder crashed]"
+
+
+def test_uploads_share_one_bound_across_files(transcriber_client, mock_large_audio_file, mock_audio_file, monkeypatch):
+    """Concurrent transcribe() calls (the CLI's --jobs) draw on the same upload slots."""
+    transcriber, client = transcriber_client
+    monkeypatch.setattr(transcriber, '_upload_slots', threading.BoundedSemaphore(2))
+    monkeypatch.setattr(transcriber, 'max_bytes', 1000)
+    running, peak, lock = 0, 0, threading.Lock()
+
+    def upload(file, model):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+        return MagicMock(text="part")
+
+    def spawn(data):
+        return SimpleNamespace(export=lambda out, format: out.write(b"x"))
+
+    # Three 1 s chunks per large file, plus whole-file uploads of the small one
+    audio = MagicMock(raw_data=bytes(80000), frame_rate=16000, frame_width=2, _spawn=spawn)
+    audio.__len__.return_value = 2500
+    client.audio.transcriptions.create.side_effect = upload
+    path, size = mock_large_audio_file
+    calls = [(path, size)] * 3 + [(mock_audio_file, 100)] * 3
+    with patch('src.transcriber.AudioSegment.from_file', return_value=audio), ThreadPoolExecutor(max_workers=6) as executor:
+        results = list(executor.map(lambda call: transcriber.transcribe(*call), calls))
+
+    assert results == ["part\n\npart\n\npart"] * 3 + ["part"] * 3
+    assert client.audio.transcriptions.create.call_count == 12
+    assert peak == 2
+
+
+@pytest.mark.parametrize("method,instruction", [
+    ("enhance_transcription", "edited for readability"),
+    ("enhance_as_interview", "interview between two people"),
+])
+def test_enhance_methods(transcriber_client, method, instruction):
+    transcriber, client = transcriber_client
+    client.chat.completions.create.return_value.choices[0].message.content = " Hello, world. \n"
+
+    assert getattr(transcriber, method)("hello world") == "Hello, world."
+    prompt = client.chat.completions.create.call_args.kwargs['messages'][-1]['content']
+    assert prompt.startswith("Transcript:\nhello world")
+    assert instruction in prompt
+
+
+def test_enhance_both_returns_both_versions(transcriber_client):
+    transcriber, client = transcriber_client
+    client.chat.completions.create.return_value.choices[0].message.content = (
+        '{"enhanced": " Hello, world. ", "interview": "Interviewer: Hello?\\n"}'
+    )
+
+    assert transcriber.enhance_both("hello world") == {"enhanced": "Hello, world.", "interview": "Interviewer: Hello?"}
+    kwargs = client.chat.completions.create.call_args.kwargs
+    assert kwargs['response_format'] == {"type": "json_object"}
+    assert kwargs['messages'][-1]['content'].startswith("Transcript:\nhello world")
+
+
+@pytest.mark.parametrize("content,error", [
+    ("not json", "not valid JSON"),
+    (None, "not valid JSON"),
+    ('["Hello", "Interviewer: Hello?"]', "missing"),
+    ('{"enhanced": "Hello"}', "missing"),
+    ('{"enhanced": "Hello", "interview": 3}', "missing"),
+], ids=["invalid_json", "empty", "not_object", "missing_key", "non_str_value"])
+def test_enhance_both_rejects_malformed_response(transcriber_client, content, error):
+    transcriber, client = transcriber_client
+    client.chat.completions.create.return_value.choices[0].message.content = content
+
+    with pytest.raises(ValueError, match=error):
+        transcriber.enhance_both("hello world")
@@ -1,21 +1,117 @@
+import hashlib
+import logging
 import os
-import unittest
-from voice_transcription_engine.utils import validate_input_path, format_transcription
 
-class TestUtils(unittest.TestCase):
+import pytest
 
-    def test_validate_input_path_valid(self):
-        valid_path = "path/to/valid/audio/file.wav"
-        self.assertTrue(validate_input_path(valid_path))
+from src import utils as utils_module
+from src.utils import WriterPool, format_transcription, hash_file, validate_input_path, validate_output_path
 
-    def test_validate_input_path_invalid(self):
-        invalid_path = "path/to/invalid/audio/file.wav"
-        self.assertFalse(validate_input_path(invalid_path))
 
-    def test_format_transcription(self):
-        transcription = "This is a test transcription."
-        formatted = format_transcription(transcription)
-        self.assertEqual(formatted, "This is a test transcription.")  # Assuming no formatting changes
+@pytest.fixture(scope="session")
+def validated_dirs(tmp_path_factory):
+    """A read-only tree shared by the path checks that do not modify the filesystem."""
+    root = tmp_path_factory.mktemp("valid")
+    (root / "dir").mkdir()
+    (root / "file.txt").write_text("x")
+    return root
 
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+
+def test_validate_input_path_valid(validated_dirs):
+    assert validate_input_path(str(validated_dirs / "dir")) is None
+
+
+def test_validate_input_path_nonexistent(validated_dirs):
+    with pytest.raises(ValueError, match="does not exist"):
+        validate_input_path(str(validated_dirs / "missing"))
+
+
+def test_validate_input_path_file_instead_of_directory(validated_dirs):
+    with pytest.raises(ValueError, match="is not a directory"):
+        validate_input_path(str(validated_dirs / "file.txt"))
+
+
+def test_validate_input_path_relative(validated_dirs, monkeypatch):
+    monkeypatch.chdir(validated_dirs)
+    assert validate_input_path("dir") is None
+
+
+def test_validate_output_path_existing_directory(validated_dirs):
+    validate_output_path(str(validated_dirs / "dir"))
+    assert (validated_dirs / "dir").is_dir()
+
+
+def test_validate_output_path_creates_nested_directories(tmp_path):
+    path = tmp_path / "a" / "b" / "c"
+    validate_output_path(str(path))
+    assert path.is_dir()
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("  Hello world  ", "Hello world"),
+    ("Line one\nLine two\nLine three", "Line one Line two Line three"),
+    ("Hello  world  test", "Hello world test"),
+    ("  First line\n  Second line  \n\nThird  line  ", "First line Second line Third line"),
+    ("", ""),
+    ("   \n  \n  ", ""),
+    ("This is a test transcription.", "This is a test transcription."),
+], ids=["strip", "newlines", "double_spaces", "mixed_whitespace", "empty", "whitespace_only", "already_formatted"])
+def test_format_transcription(text, expected):
+    assert format_transcription(text) == expected
+
+
+@pytest.fixture(scope="module")
+def hashed_file(tmp_path_factory):
+    """A file spanning several small blocks, with its expected SHA-256 digest."""
+    content = bytes(range(256)) * 40 + b"tail"
+    path = tmp_path_factory.mktemp("hash") / "audio.bin"
+    path.write_bytes(content)
+    return str(path), content
+
+
+@pytest.mark.parametrize("use_file_digest", [True, False], ids=["file_digest", "block_loop"])
+def test_hash_file_sha256_branches_agree(hashed_file, monkeypatch, use_file_digest):
+    path, content = hashed_file
+    monkeypatch.setattr(utils_module, "blake3", None)
+    if not use_file_digest:
+        monkeypatch.delattr(utils_module.hashlib, "file_digest", raising=False)
+    assert hash_file(path, block_size=1000) == ("sha256", hashlib.sha256(content).hexdigest())
+
+
+def test_hash_file_uses_blake3_when_installed(hashed_file, monkeypatch):
+    blake3 = pytest.importorskip("blake3")
+    path, content = hashed_file
+    monkeypatch.setattr(utils_module, "blake3", blake3)
+    assert hash_file(path, block_size=1000) == ("blake3", blake3.blake3(content).hexdigest())
+
+
+def test_writer_pool_writes_files_with_umask_permissions(tmp_path):
+    umask = os.umask(0o022)
+    os.umask(umask)
+    writer = WriterPool()
+    writer.submit(str(tmp_path / "a.txt"), "café".encode("utf-8"))
+    writer.submit(str(tmp_path / "b.txt"), b"")
+    writer.join()
+
+    assert (tmp_path / "a.txt").read_text(encoding="utf-8") == "café"
+    assert (tmp_path / "b.txt").read_bytes() == b""
+    assert (tmp_path / "a.txt").stat().st_mode & 0o777 == 0o666 & ~umask
+
+
+def test_writer_pool_logs_failed_write_and_keeps_going(tmp_path, caplog):
+    writer = WriterPool()
+    writer.submit(str(tmp_path / "missing" / "a.txt"), b"lost", "verbatim transcription", {"audio_file": "a.wav"})
+    writer.submit(str(tmp_path / "b.txt"), b"kept")
+    writer.join()
+
+    [error] = [record for record in caplog.records if record.levelno == logging.ERROR]
+    assert error.getMessage() == "Error saving verbatim transcription"
+    assert error.details["audio_file"] == "a.wav"
+    assert (tmp_path / "b.txt").read_bytes() == b"kept"
+
+
+def test_writer_pool_join_stops_worker_thread():
+    writer = WriterPool()
+    assert writer._thread.is_alive()
+    writer.join()
+    assert not writer._thread.is_alive()